@@ -1,6 +1,41 @@
-import json
 import os
-from typing import List, Optional
+import re
+import sys
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import orjson
+
+# Возможные статусы книги. sys.intern даёт по одному объекту-синглтону
+# на значение, так что каждая книга ссылается на одну и ту же строку,
+# а сравнение статусов сводится к сравнению указателей
+STATUS_AVAILABLE = sys.intern("в наличии")
+STATUS_ISSUED = sys.intern("выдана")
+
+# Сколько устаревших записей (перезаписанных или удалённых) допускается
+# в журнале на диске, прежде чем flush() перепишет файл целиком
+_COMPACT_THRESHOLD = 256
+
+# Буфер случайных байтов: os.urandom вызывается один раз на сотни id,
+# а не на каждую книгу; 8 байт на id вместо 4 снижают риск коллизий
+_ID_BYTES = 8
+_rng_buf: bytes = b""
+_rng_off: int = 0
+
+
+def _generate_id() -> str:
+    """
+    Генерирует уникальный идентификатор книги из буфера случайных байтов.
+
+    :return: Строка из 16 шестнадцатеричных символов.
+    """
+    global _rng_buf, _rng_off
+    if _rng_off + _ID_BYTES > len(_rng_buf):
+        _rng_buf = os.urandom(4096)
+        _rng_off = 0
+    raw = _rng_buf[_rng_off : _rng_off + _ID_BYTES]
+    _rng_off += _ID_BYTES
+    return raw.hex()
 
 
 class Book:
@@ -15,26 +50,86 @@ class Book:
     - status: str - Статус книги ("в наличии" или "выдана").
     """
 
+    # Фиксированный набор атрибутов вместо __dict__ - меньше памяти
+    # на экземпляр и быстрее доступ к атрибутам
+    __slots__ = (
+        "id",
+        "title",
+        "author",
+        "year",
+        "_status",
+        "_title_lc",
+        "_author_lc",
+        "_year_str",
+        "_cached_dict",
+    )
+
     def __init__(self, title: str, author: str, year: int):
-        self.id: str = os.urandom(4).hex()
+        self.id: str = _generate_id()
         self.title: str = title
         self.author: str = author
         self.year: int = year
-        self.status: str = "в наличии"
+        self.status: str = STATUS_AVAILABLE
+        # Кэшируем поля для поиска, чтобы не приводить строки
+        # к нижнему регистру заново при каждом запросе
+        self._title_lc: str = title.lower()
+        self._author_lc: str = author.lower()
+        self._year_str: str = str(year)
+
+    @property
+    def status(self) -> str:
+        """
+        Статус книги ("в наличии" или "выдана").
+        """
+        return self._status
+
+    @status.setter
+    def status(self, status: str) -> None:
+        self._status = status
+        # Смена статуса делает закэшированный словарь недействительным
+        self._cached_dict = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Book":
+        """
+        Создаёт объект книги из словаря с уже известными id и статусом
+        (при загрузке из файла), минуя генерацию нового id в __init__.
+
+        :param data: Словарь с информацией о книге.
+        :return: Объект книги.
+        """
+        book = cls.__new__(cls)
+        book.id = data["id"]
+        book.title = data["title"]
+        book.author = data["author"]
+        book.year = data["year"]
+        book.status = (
+            STATUS_AVAILABLE if data["status"] == STATUS_AVAILABLE else STATUS_ISSUED
+        )
+        book._title_lc = book.title.lower()
+        book._author_lc = book.author.lower()
+        book._year_str = str(book.year)
+        return book
 
     def to_dict(self) -> dict:
         """
         Преобразует объект книги в словарь для последующего сохранения.
 
+        Словарь строится лениво и кэшируется до следующего изменения
+        статуса, так что компактирование журнала не пересоздаёт словари
+        неизменившихся книг.
+
         :return: Словарь с информацией о книге.
         """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "author": self.author,
-            "year": self.year,
-            "status": self.status,
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "title": self.title,
+                "author": self.author,
+                "year": self.year,
+                "status": self._status,
+            }
+        return self._cached_dict
 
 
 class Library:
@@ -54,35 +149,138 @@ class Library:
         """
         self.data_file: str = data_file
         self.books: List[Book] = []
+        self._pending: List[bytes] = []
+        self._stale: int = 0
         self.load_books()
 
+    @property
+    def books(self) -> List[Book]:
+        """
+        Список книг в библиотеке.
+        """
+        return self._books
+
+    @books.setter
+    def books(self, books: List[Book]) -> None:
+        # При замене списка целиком перестраиваем индексы,
+        # чтобы поиск по id и проверка дубликатов оставались O(1)
+        self._books = books
+        self._by_id: Dict[str, Book] = {book.id: book for book in books}
+        self._idx: Dict[str, int] = {book.id: i for i, book in enumerate(books)}
+        self._keys: Set[Tuple[str, str, int]] = {
+            (book.title, book.author, book.year) for book in books
+        }
+        self._token_index: Dict[str, Set[str]] = {}
+        for book in books:
+            self._index_book(book)
+        # Зеркальные колонки поисковых полей (structure-of-arrays):
+        # линейный проход по ним обходится без обращений к атрибутам
+        # объектов и лучше ложится в кэш
+        self._titles_lc: List[str] = [book._title_lc for book in books]
+        self._authors_lc: List[str] = [book._author_lc for book in books]
+        self._years: List[int] = [book.year for book in books]
+
+    @staticmethod
+    def _tokenize(book: Book) -> List[str]:
+        """
+        Возвращает поисковые токены книги (слова названия и автора
+        в нижнем регистре плюс год издания).
+        """
+        return re.findall(
+            r"\w+", f"{book._title_lc} {book._author_lc} {book._year_str}"
+        )
+
+    def _index_book(self, book: Book) -> None:
+        """
+        Добавляет книгу в инвертированный индекс токен -> множество id.
+        """
+        for token in self._tokenize(book):
+            self._token_index.setdefault(token, set()).add(book.id)
+
+    def _unindex_book(self, book: Book) -> None:
+        """
+        Убирает книгу из инвертированного индекса.
+        """
+        for token in self._tokenize(book):
+            ids = self._token_index.get(token)
+            if ids is not None:
+                ids.discard(book.id)
+                if not ids:
+                    del self._token_index[token]
+
     def load_books(self) -> None:
         """
         Загружает книги из файла данных, если он существует.
+
+        Файл - журнал в формате NDJSON (одна JSON-запись на строку):
+        для каждого id действует последняя запись, а запись с пометкой
+        "deleted" означает удаление книги. Журнал читается потоково,
+        строка за строкой: каждая запись сразу превращается в объект
+        книги, так что в памяти не накапливаются разобранные словари.
         """
         if os.path.exists(self.data_file):
-            with open(self.data_file, "r", encoding="utf-8") as file:
-                books_data = json.load(file)
-                self.books = [
-                    Book(book["title"], book["author"], book["year"])
-                    for book in books_data
-                ]
-                # Устанавливаем оригинальне исторические id и статус для каждой загруженной книги
-                for book, book_data in zip(self.books, books_data):
-                    book.id = book_data["id"]
-                    book.status = book_data["status"]
+            records: Dict[str, Book] = {}
+            stale = 0
+            with open(self.data_file, "rb") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    data = orjson.loads(line)
+                    if data.get("deleted"):
+                        records.pop(data["id"], None)
+                        stale += 2
+                    else:
+                        if data["id"] in records:
+                            stale += 1
+                        records[data["id"]] = Book.from_dict(data)
+            self.books = list(records.values())
+            self._stale = stale
 
     def save_books(self) -> None:
         """
-        Сохраняет текущий список книг в файл данных.
+        Переписывает файл данных целиком текущим списком книг,
+        отбрасывая накопившиеся в журнале устаревшие записи.
+
+        Запись атомарна: данные собираются в один буфер, пишутся во
+        временный файл и подменяют основной через os.replace, поэтому
+        сбой посреди записи не оставит журнал наполовину перезаписанным.
         """
-        with open(self.data_file, "w", encoding="utf-8") as file:
-            json.dump(
-                [book.to_dict() for book in self.books],
-                file,
-                indent=4,
-                ensure_ascii=False,
-            )
+        data = b"".join(
+            orjson.dumps(book.to_dict()) + b"\n" for book in self.books
+        )
+        tmp_file = self.data_file + ".tmp"
+        with open(tmp_file, "wb") as file:
+            file.write(data)
+        os.replace(tmp_file, self.data_file)
+        self._pending.clear()
+        self._stale = 0
+
+    def flush(self) -> None:
+        """
+        Записывает накопленные изменения в файл данных, если они есть.
+
+        Изменяющие операции не пишут файл сами, а лишь ставят записи
+        в очередь - так серия операций обходится одной дозаписью в конец
+        журнала, а не переписыванием всего файла. Когда устаревших
+        записей накапливается слишком много, журнал компактируется.
+        """
+        if not self._pending:
+            return
+        if self._stale > _COMPACT_THRESHOLD:
+            self.save_books()
+        else:
+            with open(self.data_file, "ab") as file:
+                file.write(b"".join(line + b"\n" for line in self._pending))
+            self._pending.clear()
+
+    @contextmanager
+    def buffered(self) -> Iterator["Library"]:
+        """
+        Контекстный менеджер для пакетных изменений: файл данных
+        записывается один раз при выходе из блока.
+        """
+        yield self
+        self.flush()
 
     def add_book(self, title: str, author: str, year: int) -> None:
         """
@@ -93,16 +291,22 @@ class Library:
         :param year: Год издания книги.
         """
         # Проверка, существует ли уже такая книга
-        for book in self.books:
-            if book.title == title and book.author == author and book.year == year:
-                print(
-                    f"Книга с таким названием, автором и годом уже существует: {title}, {author}, {year}"
-                )
-                return
+        if (title, author, year) in self._keys:
+            print(
+                f"Книга с таким названием, автором и годом уже существует: {title}, {author}, {year}"
+            )
+            return
 
         book: Book = Book(title, author, year)
         self.books.append(book)
-        self.save_books()
+        self._idx[book.id] = len(self.books) - 1
+        self._titles_lc.append(book._title_lc)
+        self._authors_lc.append(book._author_lc)
+        self._years.append(book.year)
+        self._by_id[book.id] = book
+        self._keys.add((book.title, book.author, book.year))
+        self._index_book(book)
+        self._pending.append(orjson.dumps(book.to_dict()))
         print(f"Книга добавлена: {book.title} (ID: {book.id})")
 
     def remove_book(self, book_id: str) -> None:
@@ -113,8 +317,26 @@ class Library:
         """
         book: Optional[Book] = self.find_book_by_id(book_id)
         if book:
-            self.books.remove(book)
-            self.save_books()
+            # Удаление перестановкой с последним элементом и pop - O(1)
+            # вместо O(N)-сдвига у list.remove; порядок списка не важен,
+            # он и так задаётся порядком записей в журнале
+            i = self._idx.pop(book_id)
+            last = self.books.pop()
+            if i < len(self.books):
+                self.books[i] = last
+                self._idx[last.id] = i
+            # Та же перестановка в зеркальных колонках
+            for column in (self._titles_lc, self._authors_lc, self._years):
+                value = column.pop()
+                if i < len(column):
+                    column[i] = value
+            del self._by_id[book.id]
+            self._keys.discard((book.title, book.author, book.year))
+            self._unindex_book(book)
+            # Надгробная запись: сама строка плюс вытесненная ею
+            # запись книги становятся устаревшими
+            self._pending.append(orjson.dumps({"id": book.id, "deleted": True}))
+            self._stale += 2
             print(f"Книга удалена: {book.title}")
         else:
             print(f"Книга с ID {book_id} не найдена.")
@@ -126,10 +348,7 @@ class Library:
         :param book_id: Уникальный идентификатор книги.
         :return: Объект книги, если книга найдена или None, если не найдена.
         """
-        for book in self.books:
-            if book.id == book_id:
-                return book
-        return None
+        return self._by_id.get(book_id)
 
     def search_books(self, search_term: str) -> None:
         """
@@ -137,13 +356,29 @@ class Library:
 
         :param search_term: Строка поиска (название, автор или год).
         """
-        found_books: List[Book] = [
-            book
-            for book in self.books
-            if search_term.lower() in book.title.lower()
-            or search_term.lower() in book.author.lower()
-            or search_term in str(book.year)
-        ]
+        search_term_lc: str = search_term.lower()
+        # Целое слово (или год) находится через инвертированный индекс
+        # за O(1); на подстроки отвечает линейный проход
+        ids: Optional[Set[str]] = self._token_index.get(search_term_lc)
+        if ids:
+            found_books: List[Book] = [self._by_id[book_id] for book_id in ids]
+        else:
+            # Год сравнивается как целое число: запрос разбирается один
+            # раз, а не приводится к строке для каждой книги (запрос не
+            # из цифр не совпадёт с годом в принципе)
+            year_q: Optional[int] = (
+                int(search_term_lc) if search_term_lc.isdigit() else None
+            )
+            books = self.books
+            found_books = [
+                books[i]
+                for i, (title, author, year) in enumerate(
+                    zip(self._titles_lc, self._authors_lc, self._years)
+                )
+                if search_term_lc in title
+                or search_term_lc in author
+                or year == year_q
+            ]
         if found_books:
             for book in found_books:
                 self.display_book(book)
@@ -180,9 +415,12 @@ class Library:
         """
         book: Optional[Book] = self.find_book_by_id(book_id)
         if book:
-            if new_status in ["в наличии", "выдана"]:
+            new_status = sys.intern(new_status)
+            if new_status is STATUS_AVAILABLE or new_status is STATUS_ISSUED:
                 book.status = new_status
-                self.save_books()
+                # Новая запись книги вытесняет предыдущую в журнале
+                self._pending.append(orjson.dumps(book.to_dict()))
+                self._stale += 1
                 print(
                     f"Статус книги обновлен: {book.title} (новый статус: {book.status})"
                 )
@@ -198,9 +436,12 @@ def main() -> None:
     """
     Главная функция для работы с библиотекой через консольный интерфейс.
     """
-    library: Library = Library("library.json")
+    library: Library = Library("library.ndjson")
 
     while True:
+        # Сбрасываем накопленные изменения на диск перед выводом меню
+        library.flush()
+
         # Отображение меню пользователя
         print("\n1. Добавить книгу")
         print("2. Удалить книгу")
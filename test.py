@@ -6,31 +6,46 @@ from main import Book, Library
 class TestLibraryManagement(unittest.TestCase):
     def setUp(self):
         # Создаем экземпляр библиотеки для тестов
-        self.library = Library('test_library.json')
+        self.library = Library('test_library.ndjson')
         self.library.books = []
         self.book_data = [
             {"id": "1a2b3c4d", "title": "Война и мир", "author": "Лев Толстой", "year": 1869, "status": "в наличии"},
             {"id": "2b3c4d5e", "title": "Преступление и наказание", "author": "Федор Достоевский", "year": 1866, "status": "выдана"}
         ]
 
-    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps([]))
     @patch("os.path.exists", return_value=True)
-    def test_load_books(self, mock_exists, mock_open_func):
-        # Тест загрузки книг из файла
-        with patch("json.load", return_value=self.book_data):
+    def test_load_books(self, mock_exists):
+        # Тест загрузки книг из журнала в формате NDJSON
+        ndjson_data = "".join(json.dumps(book, ensure_ascii=False) + "\n" for book in self.book_data)
+        with patch("builtins.open", mock_open(read_data=ndjson_data)):
             self.library.load_books()
         self.assertEqual(len(self.library.books), 2)
         self.assertEqual(self.library.books[0].title, "Война и мир")
         self.assertEqual(self.library.books[1].author, "Федор Достоевский")
 
+    @patch("os.path.exists", return_value=True)
+    def test_load_books_with_tombstone(self, mock_exists):
+        # Тест загрузки: надгробная запись удаляет книгу из журнала
+        ndjson_data = (
+            "".join(json.dumps(book, ensure_ascii=False) + "\n" for book in self.book_data)
+            + json.dumps({"id": "1a2b3c4d", "deleted": True}) + "\n"
+        )
+        with patch("builtins.open", mock_open(read_data=ndjson_data)):
+            self.library.load_books()
+        self.assertEqual(len(self.library.books), 1)
+        self.assertEqual(self.library.books[0].id, "2b3c4d5e")
+
+    @patch("os.replace")
     @patch("builtins.open", new_callable=mock_open)
-    def test_save_books(self, mock_open_func):
+    def test_save_books(self, mock_open_func, mock_replace):
         # Тест сохранения книг в файл
         self.library.books = [Book("Война и мир", "Лев Толстой", 1869)]
-        # Поскольку json.dump вызывает метод write несколько раз, проверяем, что он был вызван хотя бы один раз
+        # Проверяем, что сериализованные данные были записаны во временный
+        # файл и он атомарно подменил основной
 
         self.library.save_books()
         mock_open_func().write.assert_called()
+        mock_replace.assert_called_once()
 
     def test_add_book(self):
         # Тест добавления новой книги